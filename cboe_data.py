@@ -5,14 +5,46 @@ It reuses the same code from OpenBB
 (https://github.com/OpenBB-finance/OpenBBTerminal)
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import functools
+from io import BytesIO
+import itertools
+import math
+import os
 import random
+import tempfile
+import time
+import ijson
+import orjson
 import requests
-from typing import Tuple
+from requests.adapters import HTTPAdapter
+from typing import Optional, Tuple
+import numpy as np
 import pandas as pd
+from urllib3.util.retry import Retry
 
 
-TICKER_EXCEPTIONS: list[str] = ["NDX", "RUT"]
+TICKER_EXCEPTIONS: frozenset[str] = frozenset(["NDX", "RUT"])
+
+# On-disk copies of the CBOE directories, reused across process restarts
+CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".cache", "gex_data")
+CBOE_DIRECTORY_CACHE: str = os.path.join(CACHE_DIR, "cboe_directory.pkl")
+CBOE_INDEXES_CACHE: str = os.path.join(CACHE_DIR, "cboe_indexes.pkl")
+DIRECTORY_CACHE_TTL: int = 86400
+
+# Number of concurrent requests issued by the *_many batch helpers
+MAX_WORKERS: int = 16
+
+# Number of option records parsed at a time when streaming an options chain
+OPTIONS_CHUNKSIZE: int = 5000
+
+CBOE_DIRECTORY_URL = (
+    "https://www.cboe.com/us/options/symboldir/equity_index_options/?download=csv"
+)
+CBOE_INDEXES_URL = (
+    "https://cdn.cboe.com/api/global/us_indices/definitions/all_indices.json"
+)
 
 
 def get_user_agent() -> str:
@@ -30,6 +62,90 @@ def get_user_agent() -> str:
     return random.choice(user_agent_strings)  # nosec # noqa: S311
 
 
+def create_session(pool_size: int) -> requests.Session:
+    """Create a session that pools HTTPS connections and retries transient failures.
+
+    Parameters
+    ----------
+    pool_size : int
+        How many connections are kept open per host
+
+    Returns
+    -------
+    requests.Session
+        Session to reuse across requests
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        ),
+    )
+    return session
+
+
+# Shared session so repeated calls to the CBOE hosts reuse keep-alive connections
+_SESSION = create_session(pool_size=32)
+_SESSION.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+
+# Memoized results as {(function name, args): (timestamp, result)}
+_TTL_CACHE: dict = {}
+
+
+def _is_empty_result(result) -> bool:
+    """Whether a result is an empty DataFrame (or a tuple led by one), as returned by failed requests."""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    return isinstance(result, pd.DataFrame) and result.empty
+
+
+def _copy_result(result):
+    """Copy the mutable parts of a memoized result, so callers can't alter the cached value."""
+    if isinstance(result, tuple):
+        return tuple(_copy_result(item) for item in result)
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.copy()
+    if isinstance(result, list):
+        return list(result)
+    return result
+
+
+def ttl_cache(seconds: int = 3600):
+    """Memoize a function's results for a limited number of seconds.
+
+    Empty results come from failed requests and are not memoized, so the next call retries.
+    Every caller gets its own copy of the DataFrames and lists in a memoized result.
+
+    Parameters
+    ----------
+    seconds : int
+        How many seconds a cached result is reused before calling the function again
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            cached = _TTL_CACHE.get(key)
+            if cached is not None and now - cached[0] < seconds:
+                return _copy_result(cached[1])
+
+            result = func(*args, **kwargs)
+            if _is_empty_result(result):
+                return result
+            _TTL_CACHE[key] = (now, result)
+            return _copy_result(result)
+
+        return wrapper
+
+    return decorator
+
+
 # Write an abstract helper to make requests from a url with potential headers and params
 def request(
     url: str, method: str = "get", timeout: int = 5, **kwargs
@@ -67,8 +183,8 @@ def request(
 
     if "User-Agent" not in headers:
         headers["User-Agent"] = get_user_agent()
-    func = getattr(requests, method)
-    return func(
+    return _SESSION.request(
+        method,
         url,
         headers=headers,
         timeout=timeout,
@@ -76,6 +192,194 @@ def request(
     )
 
 
+def _read_disk_cache(path: str, ttl: int) -> Optional[pd.DataFrame]:
+    """Load a pickled DataFrame if it was written less than `ttl` seconds ago."""
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            return pd.read_pickle(path)
+    except Exception:
+        # Missing, half-written or written by another pandas/numpy version: treat as a miss
+        pass
+    return None
+
+
+def _write_disk_cache(path: str, df: pd.DataFrame) -> None:
+    # Failed downloads come back empty and shouldn't be persisted
+    if df.empty:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and move it into place, so concurrent readers
+        # never see a partially written pickle
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def disk_cache(path: str, ttl: int = DIRECTORY_CACHE_TTL):
+    """Persist a function's DataFrame result to `path` and reuse it for `ttl` seconds.
+
+    Parameters
+    ----------
+    path : str
+        Pickle file where the result is stored
+    ttl : int
+        How many seconds the stored result is reused before calling the function again
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cached = _read_disk_cache(path, ttl)
+            if cached is not None:
+                return cached
+
+            result = func(*args, **kwargs)
+            _write_disk_cache(path, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _parse_json(resp: requests.Response):
+    """Decode the JSON body of a response with orjson."""
+    return orjson.loads(resp.content)
+
+
+def _iter_option_chunks(stream, chunksize: int = OPTIONS_CHUNKSIZE):
+    """Stream the option records of a quotes payload as DataFrames of `chunksize` rows."""
+    records = ijson.items(stream, "data.options.item", use_float=True)
+    while True:
+        chunk = list(itertools.islice(records, chunksize))
+        if not chunk:
+            return
+        yield pd.DataFrame.from_records(chunk)
+
+
+# Last payload of revalidated requests as {url: (etag, payload)}
+_ETAG_CACHE: dict[str, Tuple[str, dict]] = {}
+
+
+def _request_json(url: str, **kwargs) -> dict:
+    """GET and decode a JSON url, reusing the previous payload if its ETag still matches."""
+    headers = kwargs.pop("headers", {})
+    cached = _ETAG_CACHE.get(url)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+
+    resp = request(url, headers=headers, **kwargs)
+    if resp.status_code == 304 and cached is not None:
+        return cached[1]
+
+    payload = _parse_json(resp)
+    etag = resp.headers.get("ETag")
+    if etag is not None:
+        _ETAG_CACHE[url] = (etag, payload)
+    return payload
+
+
+def _fetch(url: str, timeout: int) -> bytes:
+    """Fetch the body of a url, raising on connection errors and non-2xx responses."""
+    r = request(url, timeout=timeout)
+    r.raise_for_status()
+    return r.content
+
+
+def fetch_all(urls: list[str], timeout: int = 10) -> list[bytes]:
+    """Concurrently fetch a batch of urls, overlapping their network latency.
+
+    The requests run on worker threads over the pooled session, so this is
+    safe to call from code that is already running inside an event loop.
+
+    Parameters
+    ----------
+    urls : list[str]
+        Urls to request with the GET method
+    timeout : int
+        How many seconds to wait for each server to send data
+
+    Returns
+    -------
+    list[bytes]
+        Response bodies in the same order as `urls`
+
+    Raises
+    ------
+    requests.exceptions.RequestException
+        If any of the requests fails
+    """
+    if not urls:
+        return []
+
+    fetch = functools.partial(_fetch, timeout=timeout)
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(urls))) as executor:
+        return list(executor.map(fetch, urls))
+
+
+def _parse_cboe_directory(content: bytes) -> pd.DataFrame:
+    CBOE_DIRECTORY: pd.DataFrame = pd.read_csv(BytesIO(content), engine="c")
+    CBOE_DIRECTORY.rename(
+        columns={
+            " Stock Symbol": "Symbol",
+            " DPM Name": "DPM Name",
+            " Post/Station": "Post/Station",
+        },
+        inplace=True,
+    )
+
+    return CBOE_DIRECTORY.set_index("Symbol")
+
+
+def _parse_cboe_index_directory(content: bytes) -> pd.DataFrame:
+    CBOE_INDEXES: pd.DataFrame = pd.read_json(BytesIO(content))
+
+    CBOE_INDEXES.rename(
+        columns={
+            "calc_end_time": "Close Time",
+            "calc_start_time": "Open Time",
+            "currency": "Currency",
+            "description": "Description",
+            "display": "Display",
+            "featured": "Featured",
+            "featured_order": "Featured Order",
+            "index_symbol": "Ticker",
+            "mkt_data_delay": "Data Delay",
+            "name": "Name",
+            "tick_days": "Tick Days",
+            "tick_frequency": "Frequency",
+            "tick_period": "Period",
+            "time_zone": "Time Zone",
+        },
+        inplace=True,
+    )
+
+    indices_order: list[str] = [
+        "Ticker",
+        "Name",
+        "Description",
+        "Currency",
+        "Tick Days",
+        "Frequency",
+        "Period",
+        "Time Zone",
+    ]
+
+    CBOE_INDEXES = CBOE_INDEXES.reindex(columns=indices_order).set_index("Ticker")
+
+    return CBOE_INDEXES
+
+
+@ttl_cache(seconds=3600)
+@disk_cache(CBOE_DIRECTORY_CACHE)
 def get_cboe_directory() -> pd.DataFrame:
     """Gets the US Listings Directory for the CBOE.
 
@@ -90,23 +394,16 @@ def get_cboe_directory() -> pd.DataFrame:
     >>> CBOE_DIRECTORY = cboe_model.get_cboe_directory()
     """
     try:
-        CBOE_DIRECTORY: pd.DataFrame = pd.read_csv(
-            "https://www.cboe.com/us/options/symboldir/equity_index_options/?download=csv"
-        )
-        CBOE_DIRECTORY = CBOE_DIRECTORY.rename(
-            columns={
-                " Stock Symbol": "Symbol",
-                " DPM Name": "DPM Name",
-                " Post/Station": "Post/Station",
-            }
-        ).set_index("Symbol")
-
-        return CBOE_DIRECTORY
+        r = request(CBOE_DIRECTORY_URL)
+        r.raise_for_status()
+        return _parse_cboe_directory(r.content)
 
     except requests.exceptions.HTTPError:
         return pd.DataFrame()
     
     
+@ttl_cache(seconds=3600)
+@disk_cache(CBOE_INDEXES_CACHE)
 def get_cboe_index_directory() -> pd.DataFrame:
     """Gets the US Listings Directory for the CBOE
 
@@ -121,57 +418,201 @@ def get_cboe_index_directory() -> pd.DataFrame:
     """
 
     try:
-        CBOE_INDEXES: pd.DataFrame = pd.DataFrame(
-            pd.read_json(
-                "https://cdn.cboe.com/api/global/us_indices/definitions/all_indices.json"
-            )
-        )
-
-        CBOE_INDEXES = CBOE_INDEXES.rename(
-            columns={
-                "calc_end_time": "Close Time",
-                "calc_start_time": "Open Time",
-                "currency": "Currency",
-                "description": "Description",
-                "display": "Display",
-                "featured": "Featured",
-                "featured_order": "Featured Order",
-                "index_symbol": "Ticker",
-                "mkt_data_delay": "Data Delay",
-                "name": "Name",
-                "tick_days": "Tick Days",
-                "tick_frequency": "Frequency",
-                "tick_period": "Period",
-                "time_zone": "Time Zone",
-            },
-        )
-
-        indices_order: list[str] = [
-            "Ticker",
-            "Name",
-            "Description",
-            "Currency",
-            "Tick Days",
-            "Frequency",
-            "Period",
-            "Time Zone",
-        ]
-
-        CBOE_INDEXES = pd.DataFrame(CBOE_INDEXES, columns=indices_order).set_index(
-            "Ticker"
-        )
-
-        return CBOE_INDEXES
+        r = request(CBOE_INDEXES_URL)
+        r.raise_for_status()
+        return _parse_cboe_index_directory(r.content)
 
     except requests.exceptions.HTTPError:
         return pd.DataFrame()
 
 
-# Gets the list of indexes for parsing the ticker symbol properly.
-INDEXES = get_cboe_index_directory().index.tolist()
-SYMBOLS = get_cboe_directory()
+@ttl_cache(seconds=3600)
+def _init() -> Tuple[frozenset[str], pd.DataFrame]:
+    """Load the CBOE directories from disk, or fetch both in one concurrent batch."""
+    indexes_directory = _read_disk_cache(CBOE_INDEXES_CACHE, DIRECTORY_CACHE_TTL)
+    symbols = _read_disk_cache(CBOE_DIRECTORY_CACHE, DIRECTORY_CACHE_TTL)
+
+    if indexes_directory is None or symbols is None:
+        try:
+            indexes_content, directory_content = fetch_all(
+                [CBOE_INDEXES_URL, CBOE_DIRECTORY_URL]
+            )
+        except requests.exceptions.RequestException:
+            # Fall back to the last good directories, however old, rather than
+            # caching an empty index set that would break the ticker lookups
+            indexes_directory = _read_disk_cache(CBOE_INDEXES_CACHE, math.inf)
+            symbols = _read_disk_cache(CBOE_DIRECTORY_CACHE, math.inf)
+            if indexes_directory is None or symbols is None:
+                raise
+        else:
+            indexes_directory = _parse_cboe_index_directory(indexes_content)
+            symbols = _parse_cboe_directory(directory_content)
+            _write_disk_cache(CBOE_INDEXES_CACHE, indexes_directory)
+            _write_disk_cache(CBOE_DIRECTORY_CACHE, symbols)
+
+    return frozenset(indexes_directory.index), symbols
+
+
+def refresh_directories() -> None:
+    """Discard the cached CBOE directories so the next lookup downloads them again."""
+    for path in (CBOE_INDEXES_CACHE, CBOE_DIRECTORY_CACHE):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    directory_functions = {"_init", "get_cboe_directory", "get_cboe_index_directory"}
+    for key in [key for key in _TTL_CACHE if key[0] in directory_functions]:
+        del _TTL_CACHE[key]
+
+
+def _get_indexes() -> frozenset[str]:
+    """Gets the set of indexes for parsing the ticker symbol properly."""
+    return _init()[0]
+
+
+def _get_symbols() -> pd.DataFrame:
+    """Gets the CBOE listings directory."""
+    return _init()[1]
+
+
+def __getattr__(name: str):
+    """Lazily resolves INDEXES and SYMBOLS on first access instead of at import time."""
+    if name == "INDEXES":
+        return _get_indexes()
+    if name == "SYMBOLS":
+        return _get_symbols()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_STOCK_RENAME: dict[str, str] = {
+    "current_price": "price",
+    "bid_size": "bidSize",
+    "ask_size": "askSize",
+    "iv30": "ivThirty",
+    "prev_day_close": "previousClose",
+    "price_change": "change",
+    "price_change_percent": "changePercent",
+    "iv30_change": "ivThirtyChange",
+    "iv30_percent_change": "ivThirtyChangePercent",
+    "last_trade_time": "lastTradeTimestamp",
+    "exchange_id": "exchangeID",
+    "tick": "tick",
+    "security_type": "type",
+}
+
+_STOCK_COLUMNS: list[str] = [
+    "symbol",
+    "type",
+    "tick",
+    "bid",
+    "bidSize",
+    "askSize",
+    "ask",
+    "price",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "previousClose",
+    "change",
+    "changePercent",
+    "ivThirty",
+    "ivThirtyChange",
+    "ivThirtyChangePercent",
+    "lastTradeTimestamp",
+]
+
+_INDEX_RENAME: dict[str, str] = {
+    "symbol": "symbol",
+    "security_type": "type",
+    "current_price": "price",
+    "price_change": "change",
+    "price_change_percent": "changePercent",
+    "prev_day_close": "previousClose",
+    "iv30": "ivThirty",
+    "iv30_change": "ivThirtyChange",
+    "iv30_change_percent": "ivThirtyChangePercent",
+    "last_trade_time": "lastTradeTimestamp",
+}
+
+_INDEX_COLUMNS: list[str] = [
+    "symbol",
+    "type",
+    "tick",
+    "price",
+    "open",
+    "high",
+    "low",
+    "close",
+    "previousClose",
+    "change",
+    "changePercent",
+    "ivThirty",
+    "ivThirtyChange",
+    "ivThirtyChangePercent",
+    "lastTradeTimestamp",
+]
+
+_IV_RENAME: dict[str, str] = {
+    "hv30_annual_high": "hvThirtyOneYearHigh",
+    "hv30_annual_low": "hvThirtyOneYearLow",
+    "hv60_annual_high": "hvSixtyOneYearHigh",
+    "hv60_annual_low": "hvsixtyOneYearLow",
+    "hv90_annual_high": "hvNinetyOneYearHigh",
+    "hv90_annual_low": "hvNinetyOneYearLow",
+    "iv30_annual_high": "ivThirtyOneYearHigh",
+    "iv30_annual_low": "ivThirtyOneYearLow",
+    "iv60_annual_high": "ivSixtyOneYearHigh",
+    "iv60_annual_low": "ivSixtyOneYearLow",
+    "iv90_annual_high": "ivNinetyOneYearHigh",
+    "iv90_annual_low": "ivNinetyOneYearLow",
+}
+
+_IV_ORDER: list[str] = [
+    "ivThirtyOneYearHigh",
+    "hvThirtyOneYearHigh",
+    "ivThirtyOneYearLow",
+    "hvThirtyOneYearLow",
+    "ivSixtyOneYearHigh",
+    "hvSixtyOneYearHigh",
+    "ivSixtyOneYearLow",
+    "hvsixtyOneYearLow",
+    "ivNinetyOneYearHigh",
+    "hvNinetyOneYearHigh",
+    "ivNinetyOneYearLow",
+    "hvNinetyOneYearLow",
+]
+
+
+# Rename map and column order of the ticker details for each security type
+_TICKER_DETAILS_LAYOUT: dict[str, Tuple[dict[str, str], list[str]]] = {
+    "stock": (_STOCK_RENAME, _STOCK_COLUMNS),
+    "index": (_INDEX_RENAME, _INDEX_COLUMNS),
+}
+
+
+def _build_ticker_details(
+    symbol_details: dict,
+    rename_map: dict[str, str],
+    column_order: list[str],
+    symbol: str,
+) -> pd.DataFrame:
+    """Builds the ticker details column for `symbol` from the raw symbol-info details."""
+    details = {rename_map.get(key, key): value for key, value in symbol_details.items()}
+    details["symbol"] = symbol
+
+    return (
+        pd.DataFrame([details], columns=column_order)
+        .set_index(keys="symbol")
+        .dropna(axis=1)
+        .transpose()
+    )
 
 
+# Quotes are delayed snapshots, so symbol lookups are only reused briefly
+@ttl_cache(seconds=60)
 def get_ticker_info(symbol: str) -> Tuple[pd.DataFrame, list[str]]:
     """Gets basic info for the symbol and expiration dates
 
@@ -193,19 +634,18 @@ def get_ticker_info(symbol: str) -> Tuple[pd.DataFrame, list[str]]:
     >>> vix_details,vix_expirations = cboe_model.get_ticker_info('VIX')
     """
 
-    stock = "stock"
-    index = "index"
     symbol = symbol.upper()
     new_ticker: str = ""
     ticker_details = pd.DataFrame()
     ticker_expirations: list = []
+    indexes = _get_indexes()
     try:
         if symbol in TICKER_EXCEPTIONS:
             new_ticker = "^" + symbol
-        elif symbol not in INDEXES:
+        elif symbol not in indexes:
             new_ticker = symbol
 
-        elif symbol in INDEXES:
+        elif symbol in indexes:
             new_ticker = "^" + symbol
 
             # Gets the data to return, and if none returns empty Tuple #
@@ -215,114 +655,26 @@ def get_ticker_info(symbol: str) -> Tuple[pd.DataFrame, list[str]]:
             f"{new_ticker}"
         )
 
-        symbol_info = request(symbol_info_url)
-        symbol_info_json = symbol_info.json()
-        symbol_info_json = pd.Series(symbol_info.json())
+        symbol_info_json = pd.Series(_request_json(symbol_info_url))
 
         if symbol_info_json.success is False:
             ticker_details = pd.DataFrame()
             ticker_expirations = []
             print("No data found for the symbol: " f"{symbol}" "")
         else:
-            symbol_details = pd.Series(symbol_info_json["details"])
-            symbol_details = pd.DataFrame(symbol_details).transpose()
-            symbol_details = symbol_details.reset_index()
-            ticker_expirations = symbol_info_json["expirations"]
+            symbol_details = symbol_info_json["details"]
+            # Copy, the payload is shared with the ETag cache
+            ticker_expirations = list(symbol_info_json["expirations"])
 
             # Cleans columns depending on if the security type is a stock or an index
 
-            type_ = symbol_details.security_type
-
-            if stock[0] in type_[0]:
-                stock_details = symbol_details
-                ticker_details = pd.DataFrame(stock_details).rename(
-                    columns={
-                        "current_price": "price",
-                        "bid_size": "bidSize",
-                        "ask_size": "askSize",
-                        "iv30": "ivThirty",
-                        "prev_day_close": "previousClose",
-                        "price_change": "change",
-                        "price_change_percent": "changePercent",
-                        "iv30_change": "ivThirtyChange",
-                        "iv30_percent_change": "ivThirtyChangePercent",
-                        "last_trade_time": "lastTradeTimestamp",
-                        "exchange_id": "exchangeID",
-                        "tick": "tick",
-                        "security_type": "type",
-                    }
-                )
-                details_columns = [
-                    "symbol",
-                    "type",
-                    "tick",
-                    "bid",
-                    "bidSize",
-                    "askSize",
-                    "ask",
-                    "price",
-                    "open",
-                    "high",
-                    "low",
-                    "close",
-                    "volume",
-                    "previousClose",
-                    "change",
-                    "changePercent",
-                    "ivThirty",
-                    "ivThirtyChange",
-                    "ivThirtyChangePercent",
-                    "lastTradeTimestamp",
-                ]
-                ticker_details = (
-                    pd.DataFrame(ticker_details, columns=details_columns)
-                    .set_index(keys="symbol")
-                    .dropna(axis=1)
-                    .transpose()
-                )
-
-            if index[0] in type_[0]:
-                index_details = symbol_details
-                ticker_details = pd.DataFrame(index_details).rename(
-                    columns={
-                        "symbol": "symbol",
-                        "security_type": "type",
-                        "current_price": "price",
-                        "price_change": "change",
-                        "price_change_percent": "changePercent",
-                        "prev_day_close": "previousClose",
-                        "iv30": "ivThirty",
-                        "iv30_change": "ivThirtyChange",
-                        "iv30_change_percent": "ivThirtyChangePercent",
-                        "last_trade_time": "lastTradeTimestamp",
-                    }
+            type_ = str(symbol_details["security_type"]).lower()
+            if type_ in _TICKER_DETAILS_LAYOUT:
+                rename_map, column_order = _TICKER_DETAILS_LAYOUT[type_]
+                ticker_details = _build_ticker_details(
+                    symbol_details, rename_map, column_order, symbol
                 )
 
-                index_columns = [
-                    "symbol",
-                    "type",
-                    "tick",
-                    "price",
-                    "open",
-                    "high",
-                    "low",
-                    "close",
-                    "previousClose",
-                    "change",
-                    "changePercent",
-                    "ivThirty",
-                    "ivThirtyChange",
-                    "ivThirtyChangePercent",
-                    "lastTradeTimestamp",
-                ]
-
-                ticker_details = (
-                    pd.DataFrame(ticker_details, columns=index_columns)
-                    .set_index(keys="symbol")
-                    .dropna(axis=1)
-                    .transpose()
-                ).rename(columns={f"{new_ticker}": f"{symbol}"})
-
     except requests.exceptions.HTTPError:
         print("There was an error with the request'\n")
         ticker_details = pd.DataFrame()
@@ -331,6 +683,7 @@ def get_ticker_info(symbol: str) -> Tuple[pd.DataFrame, list[str]]:
 
     return ticker_details, ticker_expirations
 
+@ttl_cache(seconds=60)
 def get_ticker_iv(symbol: str) -> pd.DataFrame:
     """Gets annualized high/low historical and implied volatility over 30/60/90 day windows.
 
@@ -351,19 +704,20 @@ def get_ticker_iv(symbol: str) -> pd.DataFrame:
     """
 
     # Checks ticker to determine if ticker is an index or an exception that requires modifying the request's URLs
+    indexes = _get_indexes()
     try:
         if symbol in TICKER_EXCEPTIONS:
             quotes_iv_url = (
                 "https://cdn.cboe.com/api/global/delayed_quotes/historical_data/_"
                 f"{symbol}.json"
             )
-        elif symbol not in INDEXES:
+        elif symbol not in indexes:
             quotes_iv_url = (
                 "https://cdn.cboe.com/api/global/delayed_quotes/historical_data/"
                 f"{symbol}.json"
             )
 
-        elif symbol in INDEXES:
+        elif symbol in indexes:
             quotes_iv_url = (
                 "https://cdn.cboe.com/api/global/delayed_quotes/historical_data/_"
                 f"{symbol}.json"
@@ -374,46 +728,14 @@ def get_ticker_iv(symbol: str) -> pd.DataFrame:
             print("No data found for the symbol: " f"{symbol}" "")
             return pd.DataFrame()
 
-        data = h_iv.json()
-        h_data = pd.DataFrame(data)[2:-1]["data"].rename(f"{symbol}")
-        h_data.rename(
-            {
-                "hv30_annual_high": "hvThirtyOneYearHigh",
-                "hv30_annual_low": "hvThirtyOneYearLow",
-                "hv60_annual_high": "hvSixtyOneYearHigh",
-                "hv60_annual_low": "hvsixtyOneYearLow",
-                "hv90_annual_high": "hvNinetyOneYearHigh",
-                "hv90_annual_low": "hvNinetyOneYearLow",
-                "iv30_annual_high": "ivThirtyOneYearHigh",
-                "iv30_annual_low": "ivThirtyOneYearLow",
-                "iv60_annual_high": "ivSixtyOneYearHigh",
-                "iv60_annual_low": "ivSixtyOneYearLow",
-                "iv90_annual_high": "ivNinetyOneYearHigh",
-                "iv90_annual_low": "ivNinetyOneYearLow",
-            },
-            inplace=True,
-        )
+        data = _parse_json(h_iv)
+        iv_data = {_IV_RENAME.get(key, key): value for key, value in data["data"].items()}
+
+        return pd.Series(iv_data).reindex(_IV_ORDER).to_frame(name=f"{symbol}")
 
-        iv_order = [
-            "ivThirtyOneYearHigh",
-            "hvThirtyOneYearHigh",
-            "ivThirtyOneYearLow",
-            "hvThirtyOneYearLow",
-            "ivSixtyOneYearHigh",
-            "hvSixtyOneYearHigh",
-            "ivSixtyOneYearLow",
-            "hvsixtyOneYearLow",
-            "ivNinetyOneYearHigh",
-            "hvNinetyOneYearHigh",
-            "ivNinetyOneYearLow",
-            "hvNinetyOneYearLow",
-        ]
-
-        ticker_iv = pd.DataFrame(h_data).transpose()
     except requests.exceptions.HTTPError:
         print("There was an error with the request'\n")
-
-    return pd.DataFrame(ticker_iv, columns=iv_order).transpose()
+        return pd.DataFrame()
 
 def get_quotes(symbol: str) -> pd.DataFrame:
     """Gets the complete options chains for a ticker.
@@ -436,6 +758,7 @@ def get_quotes(symbol: str) -> pd.DataFrame:
     """
     # Checks ticker to determine if ticker is an index or an exception that requires modifying the request's URLs.
 
+    indexes = _get_indexes()
     try:
         if symbol in TICKER_EXCEPTIONS:
             quotes_url = (
@@ -444,32 +767,35 @@ def get_quotes(symbol: str) -> pd.DataFrame:
                 ".json"
             )
         else:
-            if symbol not in INDEXES:
+            if symbol not in indexes:
                 quotes_url = (
                     "https://cdn.cboe.com/api/global/delayed_quotes/options/"
                     f"{symbol}"
                     ".json"
                 )
-            if symbol in INDEXES:
+            if symbol in indexes:
                 quotes_url = (
                     "https://cdn.cboe.com/api/global/delayed_quotes/options/_"
                     f"{symbol}"
                     ".json"
                 )
 
-        r = request(quotes_url)
-        if r.status_code != 200:
+        # Streams the options so only one chunk of records is held as Python objects
+        with request(quotes_url, stream=True) as r:
+            if r.status_code != 200:
+                print("No data found for the symbol: " f"{symbol}" "")
+                return pd.DataFrame()
+
+            r.raw.decode_content = True
+            options_chunks = list(_iter_option_chunks(r.raw))
+
+        if not options_chunks:
             print("No data found for the symbol: " f"{symbol}" "")
             return pd.DataFrame()
 
-        r_json = r.json()
-        data = pd.DataFrame(r_json["data"])
-        options = pd.Series(data.options, index=data.index)
-        options_columns = list(options[0])
-        options_data = list(options[:])
-        options_df = pd.DataFrame(options_data, columns=options_columns)
+        options_df = pd.concat(options_chunks, ignore_index=True)
 
-        options_df = options_df.rename(
+        options_df.rename(
             columns={
                 "option": "contractSymbol",
                 "bid_size": "bidSize",
@@ -481,53 +807,109 @@ def get_quotes(symbol: str) -> pd.DataFrame:
                 "last_trade_time": "lastTradeTimestamp",
                 "percent_change": "changePercent",
                 "prev_day_close": "previousClose",
-            }
+            },
+            inplace=True,
         )
 
         # Pareses the option symbols into columns for expiration, strike, and optionType
+        # OSI symbols end with a fixed-width YYMMDD + C/P + 8-digit strike (x1000) suffix
 
-        option_df_index = options_df["contractSymbol"].str.extractall(
-            r"^(?P<Ticker>\D*)(?P<expiration>\d*)(?P<optionType>\D*)(?P<strike>\d*)"
-        )
-        option_df_index = option_df_index.reset_index().drop(
-            columns=["match", "level_0"]
+        contract_symbol = options_df["contractSymbol"].str
+        option_df_index = pd.DataFrame(
+            {
+                "expiration": pd.to_datetime(contract_symbol[-15:-9], format="%y%m%d"),
+                "optionType": np.where(contract_symbol[-9:-8] == "C", "call", "put"),
+                "strike": pd.to_numeric(contract_symbol[-8:]) / 1000,
+            }
         )
-        option_df_index.optionType = option_df_index.optionType.str.replace(
-            "C", "call"
-        ).str.replace("P", "put")
-        option_df_index.strike = [ele.lstrip("0") for ele in option_df_index.strike]
-        option_df_index.strike = pd.Series(option_df_index.strike).astype(float)
-        option_df_index.strike = option_df_index.strike * (1 / 1000)
-        option_df_index.strike = option_df_index.strike.to_list()
-        option_df_index.expiration = [
-            ele.lstrip("1") for ele in option_df_index.expiration
-        ]
-        option_df_index.expiration = pd.DatetimeIndex(
-            option_df_index.expiration, yearfirst=True
-        ).astype(str)
-        option_df_index = option_df_index.drop(columns=["Ticker"])
 
         # Joins the parsed symbol into the dataframe.
 
         quotes = option_df_index.join(options_df)
 
-        now = datetime.now()
-        temp = pd.DatetimeIndex(quotes.expiration)
-        temp_ = (temp - now).days + 1
-        quotes["dte"] = temp_
+        expiration_days = quotes["expiration"].values.astype("datetime64[D]")
+        today = np.datetime64(datetime.now().date(), "D")
+        quotes["dte"] = (expiration_days - today).astype("int32")
 
         quotes = quotes.set_index(
             keys=["expiration", "strike", "optionType"]
         ).sort_index()
-        quotes["openInterest"] = quotes["openInterest"].astype(int)
-        quotes["volume"] = quotes["volume"].astype(int)
-        quotes["bidSize"] = quotes["bidSize"].astype(int)
-        quotes["askSize"] = quotes["askSize"].astype(int)
-        quotes["previousClose"] = round(quotes["previousClose"], 2)
-        quotes["changePercent"] = round(quotes["changePercent"], 2)
+        quotes = quotes.astype(
+            {
+                "openInterest": "int64",
+                "volume": "int64",
+                "bidSize": "int32",
+                "askSize": "int32",
+            }
+        )
+        quotes[["previousClose", "changePercent"]] = quotes[
+            ["previousClose", "changePercent"]
+        ].round(2)
 
     except requests.exceptions.HTTPError:
         print("There was an error with the request'\n")
         return pd.DataFrame()
 
-    return quotes.reset_index()
\ No newline at end of file
+    return quotes.reset_index()
+
+
+def _map_symbols(func, symbols: list[str]) -> dict:
+    # Warm the index directory once so the workers don't all fetch it concurrently
+    _get_indexes()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return dict(zip(symbols, executor.map(func, symbols)))
+
+
+def get_ticker_info_many(
+    symbols: list[str],
+) -> dict[str, Tuple[pd.DataFrame, list[str]]]:
+    """Gets basic info and expiration dates for several symbols concurrently.
+
+    Parameters
+    ----------
+    symbols: list[str]
+        The tickers to lookup
+
+    Returns
+    -------
+    dict[str, Tuple[pd.DataFrame, list[str]]]
+        get_ticker_info results keyed by symbol
+    """
+    return _map_symbols(get_ticker_info, symbols)
+
+
+def get_ticker_iv_many(symbols: list[str]) -> dict[str, pd.DataFrame]:
+    """Gets historical and implied volatility for several symbols concurrently.
+
+    Parameters
+    ----------
+    symbols: list[str]
+        The tickers to lookup
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        get_ticker_iv results keyed by symbol
+    """
+    return _map_symbols(get_ticker_iv, symbols)
+
+
+def get_quotes_many(symbols: list[str]) -> dict[str, pd.DataFrame]:
+    """Gets the complete options chains for several symbols concurrently.
+
+    Parameters
+    ----------
+    symbols: list[str]
+        The tickers to get options data for
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        get_quotes results keyed by symbol
+
+    Examples
+    --------
+    >>> chains = get_quotes_many(['SPX', 'XSP', 'AAPL'])
+    >>> spx_chains = chains['SPX']
+    """
+    return _map_symbols(get_quotes, symbols)
@@ -1,29 +1,31 @@
 """Functions to connect and retrieve data from databases"""
 
 import os 
-from io import BytesIO, StringIO, TextIOWrapper
+from io import BytesIO, StringIO
 import gzip
 import datetime
-import requests
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
 import pandas as pd
-import yfinance as yf
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from pymongo import MongoClient
 from bson.objectid import ObjectId
-import cloudinary
-import cloudinary.uploader
 
-from cboe_data import get_quotes, get_ticker_info
+from cboe_data import create_session, get_quotes, get_ticker_info
 from gamma_exposure import calculate_gamma_profile, calculate_spot_total_gamma_call_puts
 from config import CONFIG
 
 # Get env variables
 load_dotenv()
 
+# Shared HTTP session, so repeated downloads from object storage reuse connections
+_http = create_session(pool_size=10)
+
 # Create engine for PostgreSQL
 # ============================
 PG_USER_NAME = os.environ.get('PG_USER_NAME','Unable to retrieve PG_USER_NAME')
@@ -33,14 +35,21 @@ PG_REGION = os.environ.get('PG_REGION','Unable to retrieve PG_REGION')
 PG_URL_PORT = os.environ.get('PG_URL_PORT','Unable to retrieve PG_URL_PORT')
 
 pool_connection = f"postgresql://{PG_USER_NAME}.{PG_REF_ID}:{PG_USER_PWD}@{PG_REGION}:{PG_URL_PORT}/postgres"
-engine = create_engine(pool_connection,pool_pre_ping=True, pool_size=15)
-engine.connect()
 
 Base = declarative_base()
 
-# Create a session to interact with the database
-SessionLocal = sessionmaker(autocommit=False,autoflush=False,bind=engine)
-session = SessionLocal()
+
+@lru_cache(maxsize=None)
+def _get_engine():
+    """Create the PostgreSQL engine on first use"""
+    return create_engine(pool_connection,pool_pre_ping=True, pool_size=15)
+
+
+@lru_cache(maxsize=None)
+def _get_session() -> Session:
+    """Create a session to interact with the database on first use"""
+    SessionLocal = sessionmaker(autocommit=False,autoflush=False,bind=_get_engine())
+    return SessionLocal()
 
 
 # Create connection for MongoDB
@@ -53,24 +62,60 @@ MONGO_DB_NAME = os.environ.get('MONGO_DB_NAME','Unable to retrieve MONGO_DB_NAME
 mongo_url = f"mongodb+srv://{MONGO_USER}:{MONGO_PWD}@{MONGO_DB_URL}/?retryWrites=true&w=majority"
 
 
+@lru_cache(maxsize=None)
+def _get_mongo_database():
+    """Create a single MongoDB client on first use, its connection pool is shared by every call"""
+    mongodb_client = MongoClient(mongo_url, maxPoolSize=50)
+    atexit.register(mongodb_client.close)
+    return mongodb_client[MONGO_DB_NAME]
+
+
 # Create connection for Cloudinary
 # ================================
 CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY','Unable to retrieve CLOUDINARY_API_KEY')
 CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET','Unable to retrieve CLOUDINARY_API_SECRET')
 CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME','Unable to retrieve CLOUDINARY_CLOUD_NAME')
 
-cloudinary.config( 
-  cloud_name = CLOUDINARY_CLOUD_NAME, 
-  api_key = CLOUDINARY_API_KEY, 
-  api_secret = CLOUDINARY_API_SECRET,
-  secure=True,
-)
+
+@lru_cache(maxsize=None)
+def _configure_cloudinary():
+    """Import and configure cloudinary on first use"""
+    import cloudinary
+
+    cloudinary.config( 
+      cloud_name = CLOUDINARY_CLOUD_NAME, 
+      api_key = CLOUDINARY_API_KEY, 
+      api_secret = CLOUDINARY_API_SECRET,
+      secure=True,
+    )
+
+
+def _insert_concurrently(mongo_database, documents:list) -> list:
+    """
+    Insert documents into their collections concurrently, so the round-trips overlap
+
+    Args:
+        mongo_database: MongoDB database where the collections live
+        documents (list): (collection name, document) pairs to insert
+
+    Returns:
+        list: inserted ids, in the same order as documents
+    """
+    with ThreadPoolExecutor(max_workers=len(documents)) as executor:
+        futures = [
+            executor.submit(mongo_database[collection_name].insert_one, document)
+            for collection_name, document in documents
+        ]
+        return [future.result().inserted_id for future in futures]
 
 
 def store_raw_option_chains() -> dict:
     """
     Retrieve (delayed) option chains from CBOE and store them
     """
+    import cloudinary.uploader
+
+    _configure_cloudinary()
     
     # Fetch data from CBOE
     option_chain = get_quotes(symbol=CONFIG['CBOE_TICKER'])
@@ -82,19 +127,18 @@ def store_raw_option_chains() -> dict:
     option_chain_ticker_info = get_ticker_info(symbol=CONFIG['CBOE_TICKER'])[0]
     delayed_timestamp = option_chain_ticker_info.loc['lastTradeTimestamp',:].item()
     
-    # Store compressed .tag.gz file in object storage
-    fname_decompressed = f'df_test_memory.csv'
-    fname_cloudinary = f'cboe_opt_chain_timestamp_{query_timestamp.strftime("%Y-%m-%dT%H:%M:%S%z")}_delayed_{delayed_timestamp}.tar.gz'
+    # Store compressed .parquet file in object storage
+    fname_cloudinary = f'cboe_opt_chain_timestamp_{query_timestamp.strftime("%Y-%m-%dT%H:%M:%S%z")}_delayed_{delayed_timestamp}.parquet'
 
 
     with BytesIO() as buf:
-        with gzip.GzipFile(fileobj=buf, mode='w') as gz_file:
-            # gz_file.write(df_upload)
-            option_chain.to_csv(TextIOWrapper(gz_file, 'utf8'), index=False, header=True)
+        option_chain.to_parquet(buf, compression='zstd', index=False)
 
-        # Upload file to cloudinary
-        response_compressed = cloudinary.uploader.upload(
-            file=buf.getvalue(), 
+        # Upload file to cloudinary, streaming the buffer in chunks instead of copying it
+        buf.seek(0)
+        response_compressed = cloudinary.uploader.upload_large(
+            buf, 
+            chunk_size=6_000_000,
             public_id=fname_cloudinary, # 'id_name'
             unique_filename = False, 
             overwrite=True,
@@ -107,24 +151,23 @@ def store_raw_option_chains() -> dict:
     response_compressed['query_timestamp'] = query_timestamp.strftime("%Y-%m-%dT%H:%M:%S%z")
     response_compressed['delayed_timestamp'] = delayed_timestamp
 
+    mongo_database = _get_mongo_database()
+    
     # Create MongoDB document with upload information
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_UPLOADS']]
-        
-        # Insert execution details in mongo
-        upload_id = mongo_collection.insert_one(response_compressed).inserted_id
-        
-        # Add post_id info to dict
-        response_compressed['mongodb_upload_id'] = str(upload_id)
-        
-        # Insert quote info in mongo
-        dict_option_chain_ticker_info = option_chain_ticker_info.to_dict()[CONFIG['CBOE_TICKER']]
-        dict_option_chain_ticker_info['ticker'] = CONFIG['CBOE_TICKER']
-        dict_option_chain_ticker_info['mongodb_upload_id'] = response_compressed['mongodb_upload_id']
-        
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_QUOTE_INFO']]
-        info_id = mongo_collection.insert_one(dict_option_chain_ticker_info).inserted_id
+    # The quote info references this upload, so it is only written once the upload insert succeeded
+    mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_UPLOADS']]
+    upload_id = mongo_collection.insert_one(response_compressed).inserted_id
+    
+    # Insert quote info in mongo
+    dict_option_chain_ticker_info = option_chain_ticker_info.to_dict()[CONFIG['CBOE_TICKER']]
+    dict_option_chain_ticker_info['ticker'] = CONFIG['CBOE_TICKER']
+    dict_option_chain_ticker_info['mongodb_upload_id'] = str(upload_id)
+    
+    mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_QUOTE_INFO']]
+    info_id = mongo_collection.insert_one(dict_option_chain_ticker_info).inserted_id
+    
+    # Add post_id info to dict
+    response_compressed['mongodb_upload_id'] = str(upload_id)
         
 
     # Return dict with upload id
@@ -141,25 +184,17 @@ def store_execution_details_sql(response_compressed:dict) -> int:
     )
     
     # Write to sql
+    session = _get_session()
     session.add(id_table)
+    # Flush to get the autoincrement id without querying the record back
+    session.flush()
+    id_sql = id_table.id
     session.commit()
     
-    # Fetch id of new record
-    result = session.query(IdTable).filter(IdTable.mongodb_id == str(response_compressed['_id']))
-    df_id = pd.read_sql(result.statement,session.bind)
-    
-    id_sql = df_id['id'].item()
-    
     return id_sql
         
     
-def store_gamma_profile(secure_url:str, spot_price:float, last_trade_date:pd.Timestamp, mongodb_upload_id:str):
-    
-    # Retrieve option chain from url
-    option_chain_long = get_df_from_storage(secure_url=secure_url)
-    option_chain_long['expiration'] = pd.to_datetime(option_chain_long['expiration'])
-    
-    print(f" - GAMMA PROFILE: option chain retrieved (shape {option_chain_long.shape})")
+def store_gamma_profile(option_chain_long:pd.DataFrame, spot_price:float, last_trade_date:pd.Timestamp, mongodb_upload_id:str):
     
     gex_profile, zero_gamma = calculate_gamma_profile(
         option_chain_long=option_chain_long, 
@@ -183,26 +218,18 @@ def store_gamma_profile(secure_url:str, spot_price:float, last_trade_date:pd.Tim
     # Fix date format
     mongo_doc_zero_gamma[mongodb_upload_id]['index'] = [last_trade_date]
     
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_GEX_PROFILE']]
-        
-        # Insert execution details in mongo
-        upload_id = mongo_collection.insert_one(mongo_doc).inserted_id
-        
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_GEX_ZERO_GAMMA']]
-        
-        # Insert execution details in mongo
-        upload_id_zero = mongo_collection.insert_one(mongo_doc_zero_gamma).inserted_id
+    mongo_database = _get_mongo_database()
     
-    return upload_id, upload_id_zero
+    # Insert execution details in mongo
+    upload_id, upload_id_zero = _insert_concurrently(mongo_database, [
+        (CONFIG['MONGODB_COLECTION_GEX_PROFILE'], mongo_doc),
+        (CONFIG['MONGODB_COLECTION_GEX_ZERO_GAMMA'], mongo_doc_zero_gamma),
+    ])
     
+    return upload_id, upload_id_zero
     
-def store_total_gamma(secure_url:str, spot_price:float, mongodb_upload_id:str):
     
-    # Retrieve option chain from url
-    option_chain_long = get_df_from_storage(secure_url=secure_url)
-    option_chain_long['expiration'] = pd.to_datetime(option_chain_long['expiration'])
+def store_total_gamma(option_chain_long:pd.DataFrame, spot_price:float, mongodb_upload_id:str):
     
     gamma_strikes = calculate_spot_total_gamma_call_puts(
         option_chain_long=option_chain_long, 
@@ -213,13 +240,12 @@ def store_total_gamma(secure_url:str, spot_price:float, mongodb_upload_id:str):
         mongodb_upload_id:gamma_strikes.reset_index().to_dict('list')
     }
     
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_GEX_STRIKES']]
-        
-        # Insert execution details in mongo
-        upload_id = mongo_collection.insert_one(mongo_doc).inserted_id
-        
+    mongo_database = _get_mongo_database()
+    mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_GEX_STRIKES']]
+    
+    # Insert execution details in mongo
+    upload_id = mongo_collection.insert_one(mongo_doc).inserted_id
+    
     return upload_id  
         
     
@@ -236,12 +262,37 @@ def get_df_from_storage(secure_url:str) -> pd.DataFrame:
     """
     query = {'raw': 'true'} 
     headers={'User-agent': 'Mozilla/5.0'}
-    response = requests.get(secure_url, params=query, headers=headers, stream=True)
-    
-    with gzip.open(BytesIO(response.content), 'rt') as gzip_file:
-        df = pd.read_csv(gzip_file, sep=',', skiprows=0, index_col=None)
+    # The timeout bounds every read, so a stalled download can't hang the update task
+    with _http.get(secure_url, params=query, headers=headers, stream=True, timeout=30) as response:
+        if secure_url.endswith('.parquet'):
+            # Parquet needs random access to its footer, so the body is read at once
+            return pd.read_parquet(BytesIO(response.content))
+        
+        # Option chains stored before the switch to parquet are gzipped CSV files.
+        # Decompress while the body streams in and parse it with pyarrow's multi-threaded reader
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        
+        # Types of the option chain columns used in the gamma calculations,
+        # so the CSV parser doesn't have to infer them
+        column_types = {
+            'expiration': pa.timestamp('ns'),
+            'strike': pa.float64(),
+            'optionType': pa.string(),
+            'impliedVolatility': pa.float64(),
+            'openInterest': pa.int64(),
+            'gamma': pa.float64(),
+        }
         
-    return df
+        response.raw.decode_content = True
+        with gzip.GzipFile(fileobj=response.raw) as gzip_file:
+            table = pacsv.read_csv(
+                gzip_file,
+                parse_options=pacsv.ParseOptions(delimiter=','),
+                convert_options=pacsv.ConvertOptions(column_types=column_types),
+            )
+        
+    return table.to_pandas()
     
 def get_quote_info_from_mongo(mongodb_upload_id:str) -> pd.DataFrame:
     """
@@ -253,14 +304,13 @@ def get_quote_info_from_mongo(mongodb_upload_id:str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: quote information for that execution
     """
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_QUOTE_INFO']]
-        
-        dict_info = mongo_collection.find_one(filter={'mongodb_upload_id':str(mongodb_upload_id)},)
-        
-        df_info = pd.DataFrame({CONFIG['CBOE_TICKER']:dict_info})
-        
+    mongo_database = _get_mongo_database()
+    mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_QUOTE_INFO']]
+    
+    dict_info = mongo_collection.find_one(filter={'mongodb_upload_id':str(mongodb_upload_id)},)
+    
+    df_info = pd.DataFrame({CONFIG['CBOE_TICKER']:dict_info})
+    
     return df_info
 
 def get_upload_info_from_mongo(mongodb_upload_id:str) -> pd.DataFrame:
@@ -273,17 +323,17 @@ def get_upload_info_from_mongo(mongodb_upload_id:str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: quote information for that execution
     """
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_UPLOADS']]
-        
-        dict_info = mongo_collection.find_one(filter={'_id':ObjectId(mongodb_upload_id)},)
-        
+    mongo_database = _get_mongo_database()
+    mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_UPLOADS']]
+    
+    dict_info = mongo_collection.find_one(filter={'_id':ObjectId(mongodb_upload_id)},)
+    
     return dict_info
     
     
 def get_execution_id() -> pd.DataFrame:
     from data_models import IdTable
+    session = _get_session()
     result = session.query(IdTable)
     df_id = pd.read_sql(result.statement,session.bind)
     
@@ -291,6 +341,8 @@ def get_execution_id() -> pd.DataFrame:
     
     
 def get_ohlc_data() -> pd.DataFrame:
+    import yfinance as yf
+
     yfin_ticker = yf.Ticker(CONFIG['YFIN_TICKER'])
     
     # get historical market data
@@ -298,44 +350,62 @@ def get_ohlc_data() -> pd.DataFrame:
     
     return yfin_hist
 
-def get_gex_levels_data() -> dict:
-    dict_gex_levels = dict()
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_GEX_STRIKES']]
-        
-        cursor = mongo_collection.find({})
-        for document in cursor:
-            doc_keys = list(document.keys())
-            dict_gex_levels[doc_keys[-1]] = document[doc_keys[-1]]
-    
-    return dict_gex_levels
-
-def get_gex_profile_data() -> dict:
-    dict_gex_profile = dict()
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_GEX_PROFILE']]
-        
-        cursor = mongo_collection.find({})
-        for document in cursor:
-            doc_keys = list(document.keys())
-            dict_gex_profile[doc_keys[-1]] = document[doc_keys[-1]]
-    
-    return dict_gex_profile
-
-def get_zero_gamma_data() -> dict:
-    dict_zero_gamma = dict()
-    with MongoClient(mongo_url) as mongodb_client:
-        mongo_database = mongodb_client[MONGO_DB_NAME]
-        mongo_collection = mongo_database[CONFIG['MONGODB_COLECTION_GEX_ZERO_GAMMA']]
-        
-        cursor = mongo_collection.find({})
-        for document in cursor:
-            doc_keys = list(document.keys())
-            dict_zero_gamma[doc_keys[-1]] = document[doc_keys[-1]]
+def _get_collection_data(collection_name:str, since:datetime.datetime=None, after:str=None, limit:int=None) -> tuple:
+    """
+    Retrieve a page of the {mongodb_upload_id: data} documents of a collection as a single dict
+
+    Without since/after the most recent documents are returned. With either of them the
+    documents are paged forward in insertion order: pass the returned cursor as `after`
+    to get the next page, until an empty page comes back.
+
+    Args:
+        collection_name (str): name of the MongoDB collection
+        since (datetime.datetime, optional): only return documents inserted from this time on (naive values are UTC). Defaults to None.
+        after (str, optional): cursor returned by a previous call, only documents inserted after it are returned. Defaults to None.
+        limit (int, optional): maximum number of documents returned. Defaults to None (no limit).
+
+    Returns:
+        tuple: dict with the data of each execution keyed by its mongodb_upload_id in chronological order,
+            and the cursor of the last document returned (None if there are none)
+    """
+    dict_data = dict()
+    mongo_database = _get_mongo_database()
+    mongo_collection = mongo_database[collection_name]
     
-    return dict_zero_gamma
+    # ObjectIds start with their creation time, so the default _id index
+    # serves the time filter, the cursor and the sort
+    query = {}
+    if since is not None:
+        query.setdefault('_id', {})['$gte'] = ObjectId.from_datetime(since)
+    if after is not None:
+        query.setdefault('_id', {})['$gt'] = ObjectId(after)
+    
+    # Page forward from the lower bound, or take the latest documents when there is none
+    paging = bool(query)
+    cursor = mongo_collection.find(query).sort('_id', 1 if paging else -1).batch_size(1000)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    
+    documents = list(cursor)
+    if not paging:
+        documents.reverse()
+    
+    last_id = None
+    for document in documents:
+        # Drop _id so only the {mongodb_upload_id: data} pair is returned
+        last_id = str(document.pop('_id'))
+        dict_data.update(document)
+    
+    return dict_data, last_id
+
+def get_gex_levels_data(since:datetime.datetime=None, after:str=None, limit:int=None) -> tuple:
+    return _get_collection_data(CONFIG['MONGODB_COLECTION_GEX_STRIKES'], since=since, after=after, limit=limit)
+
+def get_gex_profile_data(since:datetime.datetime=None, after:str=None, limit:int=None) -> tuple:
+    return _get_collection_data(CONFIG['MONGODB_COLECTION_GEX_PROFILE'], since=since, after=after, limit=limit)
+
+def get_zero_gamma_data(since:datetime.datetime=None, after:str=None, limit:int=None) -> tuple:
+    return _get_collection_data(CONFIG['MONGODB_COLECTION_GEX_ZERO_GAMMA'], since=since, after=after, limit=limit)
 
 def update_database():
     print('Fetch new option data from source')
@@ -356,21 +426,36 @@ def update_database():
     
     print(f'Last trade date obtained: {last_trade_date}')
     
-    # Calculate gamma exposure and store in database
-    upload_id_profile, upload_id_zero = store_gamma_profile(
-        secure_url=response['secure_url'], 
-        spot_price=spot_price, 
-        last_trade_date=last_trade_date, 
-        mongodb_upload_id=str(response['_id']))
+    # Retrieve option chain from url once for both calculations
+    option_chain_long = get_df_from_storage(secure_url=response['secure_url'])
     
-    print('Gamma profile has been stored in db')
+    # float32 holds more precision than the gamma estimates carry and halves the memory traffic
+    option_chain_long = option_chain_long.astype(
+        {column: 'float32' for column in ['strike', 'gamma', 'impliedVolatility', 'openInterest']})
     
-    upload_id_total_gamma = store_total_gamma(
-        secure_url=response['secure_url'], 
-        spot_price=spot_price, 
-        mongodb_upload_id=str(response['_id']))
+    print(f'Option chain retrieved (shape {option_chain_long.shape})')
     
-    print('Total gamma has been stored')
+    # Calculate gamma exposure and store in database
+    # Both calculations add columns to the option chain, so each one gets its own copy
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_profile = executor.submit(
+            store_gamma_profile,
+            option_chain_long=option_chain_long.copy(), 
+            spot_price=spot_price, 
+            last_trade_date=last_trade_date, 
+            mongodb_upload_id=str(response['_id']))
+        
+        future_total_gamma = executor.submit(
+            store_total_gamma,
+            option_chain_long=option_chain_long, 
+            spot_price=spot_price, 
+            mongodb_upload_id=str(response['_id']))
+        
+        upload_id_profile, upload_id_zero = future_profile.result()
+        print('Gamma profile has been stored in db')
+        
+        upload_id_total_gamma = future_total_gamma.result()
+        print('Total gamma has been stored')
     
 
 if __name__ == '__main__':
@@ -6,9 +6,19 @@ Gamma Exposure = Unit Gamma * Open Interest * Spot Price
 To further convert into 'per 1% move' quantity, multiply by 1% of Spot Price
 """
 
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import pandas as pd 
 import numpy as np 
-from scipy.stats import norm
+
+logger = logging.getLogger(__name__)
+
+# Standard normal pdf normalization, 1/sqrt(2*pi)
+_INV_SQRT_2PI = 0.3989422804014327
 
 # Get gamma exposure for Black-Scholes European-Options
 def calc_gamma(S, K, vol, T, r, q, option_type):
@@ -20,9 +30,9 @@ def calc_gamma(S, K, vol, T, r, q, option_type):
     dm = dp - vol*np.sqrt(T) 
 
     if option_type == 'call':
-        gamma = np.exp(-q*T) * norm.pdf(dp) / (S * vol * np.sqrt(T))
+        gamma = np.exp(-q*T) * math.exp(-0.5*dp*dp) * _INV_SQRT_2PI / (S * vol * np.sqrt(T))
     else: # Gamma is same for calls and puts. This is just to cross-check
-        gamma = K * np.exp(-r*T) * norm.pdf(dm) / (S * S * vol * np.sqrt(T))
+        gamma = K * np.exp(-r*T) * math.exp(-0.5*dm*dm) * _INV_SQRT_2PI / (S * S * vol * np.sqrt(T))
         
     return gamma
       
@@ -35,6 +45,40 @@ def calc_gamma_exposure(S, K, vol, T, r, q, option_type, open_interest):
     
     return gamma_exposure
 
+def calc_gamma_vec(S, K, vol, T, r, q):
+    """
+    Vectorized Black-Scholes gamma, broadcasting spot levels against options
+    
+    S is usually a column of spot levels (L, 1) and the rest option arrays (N,),
+    giving a (L, N) matrix. Options with T == 0 or vol == 0 have zero gamma.
+    """
+    valid = (T > 0) & (vol > 0)
+    vol = np.where(valid, vol, 1.0)
+    T = np.where(valid, T, 1.0)
+    
+    vol_sqrt_T = vol*np.sqrt(T)
+    dp = (np.log(S/K) + (r - q + 0.5*vol**2)*T) / vol_sqrt_T
+    
+    # Gamma is same for calls and puts
+    gamma = np.exp(-q*T) * np.exp(-0.5*dp*dp) * _INV_SQRT_2PI / (S * vol_sqrt_T)
+    
+    return np.where(valid, gamma, 0.0)
+
+
+def calc_gamma_exposure_vec(S, K, vol, T, r, q, open_interest):
+    
+    gamma = calc_gamma_vec(S, K, vol, T, r, q)
+
+    gamma_exposure = open_interest * 100 * (S**2) * 0.01 * gamma 
+    
+    return gamma_exposure
+
+def _gamma_profile_chunk(levels, K, vol, T, open_interest, weights):
+    """Weighted sums of the gamma exposure of every option at each of the given spot levels"""
+    gamma_exposure = calc_gamma_exposure_vec(levels[:, None], K, vol, T, 0, 0, open_interest)
+    
+    return gamma_exposure @ weights
+
 def calc_gamma_exposure_shares(S, K, vol, T, r, q, option_type, open_interest):
     
     gamma = calc_gamma(S, K, vol, T, r, q, option_type)
@@ -62,108 +106,38 @@ def calculate_spot_total_gamma_call_puts(option_chain_long: pd.DataFrame, spot_p
     
     # Get gamma exposure
     # ==================
-    idx_puts = option_chain_long['optionType'] == 'put'
-    
-    option_chain_long['gammaExposure_theoretical'] = (
-        option_chain_long['gamma'] * option_chain_long['openInterest']
-    )
-    
-    option_chain_long['gammaExposure_shares'] = (
-        option_chain_long['gamma'] * option_chain_long['openInterest'] * 100 * (spot_price)
-    )
-        
-    option_chain_long['gammaExposure'] = (
-        option_chain_long['gamma'] * option_chain_long['openInterest'] * 100 * (spot_price**2) * 0.01
-    )
-    
-    option_chain_long.loc[idx_puts,'gammaExposure'] *= -1
-    option_chain_long.loc[idx_puts,'gammaExposure_shares'] *= -1
-    option_chain_long.loc[idx_puts,'gammaExposure_theoretical'] *= -1
-    
-    # Get total gamma
-    # ===============
-    # Total gamma requires adding the gammaExposure for each strike
-    total_gamma = (
-        option_chain_long[['expiration','strike','optionType','gammaExposure']]
-        .groupby(by=['expiration','optionType','strike'])
-        .sum()
-        .div(10**9)
-    )
-    
-    total_gamma_agg = (
-        total_gamma
-        .droplevel(level=[0,1])
-        .reset_index()
-        .groupby(['strike'])
-        .sum()
-    )
-    
-    total_gamma_share = (
-        option_chain_long[['expiration','strike','optionType','gammaExposure_shares']]
-        .groupby(by=['expiration','optionType','strike'])
-        .sum()
-        .div(10**9)
-    )
-    
-    total_gamma_agg_share = (
-        total_gamma_share
-        .droplevel(level=[0,1])
-        .reset_index()
-        .groupby(['strike'])
-        .sum()
-    )
-    
-    total_gamma_theoretical = (
-        option_chain_long[['expiration','strike','optionType','gammaExposure_theoretical']]
-        .groupby(by=['expiration','optionType','strike'])
+    # Puts subtract gamma exposure, so the sign is applied once to the base product
+    sign = np.where(option_chain_long['optionType'].to_numpy() == 'put', -1.0, 1.0).astype(option_chain_long['gamma'].dtype)
+    gamma_base = option_chain_long['gamma'].to_numpy() * option_chain_long['openInterest'].to_numpy() * sign
+    
+    option_chain_long['gammaExposure_theoretical'] = gamma_base
+    option_chain_long['gammaExposure_shares'] = gamma_base * 100 * (spot_price)
+    option_chain_long['gammaExposure'] = gamma_base * 100 * (spot_price**2) * 0.01
+    
+    # Get total gamma by calls and puts
+    # ==================================
+    # One groupby for the three metrics, with calls and puts side by side
+    gamma_columns = ['gammaExposure', 'gammaExposure_shares', 'gammaExposure_theoretical']
+    gamma_by_type = (
+        option_chain_long
+        .groupby(by=['strike', 'optionType'])[gamma_columns]
         .sum()
         .div(10**9)
+        .unstack('optionType')
+        .reindex(columns=pd.MultiIndex.from_product([gamma_columns, ['call', 'put']]))
     )
     
-    total_gamma_agg_theo = (
-        total_gamma_theoretical
-        .droplevel(level=[0,1])
-        .reset_index()
-        .groupby(['strike'])
-        .sum()
-    )
-    
-    # Now get total gamma by calls and puts
-    # =====================================
-    gamma_exp_call = option_chain_long.loc[option_chain_long['optionType'] == 'call',['strike','gammaExposure']].groupby(by='strike').sum()/ 10**9
-    gamma_exp_put = option_chain_long.loc[option_chain_long['optionType'] == 'put',['strike','gammaExposure']].groupby(by='strike').sum()/ 10**9
-    
-    gamma_exp_call_share = option_chain_long.loc[option_chain_long['optionType'] == 'call',['strike','gammaExposure_shares']].groupby(by='strike').sum()/ 10**9
-    gamma_exp_put_share = option_chain_long.loc[option_chain_long['optionType'] == 'put',['strike','gammaExposure_shares']].groupby(by='strike').sum()/ 10**9
-    
-    gamma_exp_call_theo = option_chain_long.loc[option_chain_long['optionType'] == 'call',['strike','gammaExposure_theoretical']].groupby(by='strike').sum()/ 10**9
-    gamma_exp_put_theo = option_chain_long.loc[option_chain_long['optionType'] == 'put',['strike','gammaExposure_theoretical']].groupby(by='strike').sum()/ 10**9
-    
     # Prepare output table
     # ====================
-    gamma_strikes = pd.concat([
-        total_gamma_agg,
-        gamma_exp_call,
-        gamma_exp_put,
-        total_gamma_agg_share,
-        gamma_exp_call_share,
-        gamma_exp_put_share,
-        total_gamma_agg_theo,
-        gamma_exp_call_theo,
-        gamma_exp_put_theo,
-    ],axis=1)
-    
-    gamma_strikes.columns = [
-        'Total Gamma',
-        'Total Gamma Call',
-        'Total Gamma Put',
-        'Total Gamma (share)',
-        'Total Gamma (share) Call',
-        'Total Gamma (share) Put',
-        'Total Gamma (theo)',
-        'Total Gamma (theo) Call',
-        'Total Gamma (theo) Put',
-    ]
+    gamma_strikes = pd.DataFrame(index=gamma_by_type.index)
+    for column, label in zip(gamma_columns, ['Total Gamma', 'Total Gamma (share)', 'Total Gamma (theo)']):
+        gamma_call = gamma_by_type[(column, 'call')]
+        gamma_put = gamma_by_type[(column, 'put')]
+        
+        # Total gamma requires adding the gammaExposure of calls and puts for each strike
+        gamma_strikes[label] = gamma_call.add(gamma_put, fill_value=0)
+        gamma_strikes[f'{label} Call'] = gamma_call
+        gamma_strikes[f'{label} Put'] = gamma_put
     
     return gamma_strikes
 
@@ -181,49 +155,60 @@ def calculate_gamma_profile(option_chain_long: pd.DataFrame, spot_price: float,
     levels = np.linspace(from_strike, to_strike, 60)
     
     # For 0DTE options, I'm setting DTE = 1 day, otherwise they get excluded
-    option_chain_long['Days untill Expiry'] = [1/262 if (np.busday_count(last_trade_date.date(), x.date())) == 0 \
-                            else np.busday_count(last_trade_date.date(), x.date())/262 for x in option_chain_long['expiration']]
+    expiration_days = option_chain_long['expiration'].values.astype('datetime64[D]')
+    business_days = np.busday_count(np.datetime64(last_trade_date.date()), expiration_days)
+    option_chain_long['Days untill Expiry'] = np.where(business_days == 0, 1, business_days) / 262
 
     next_expiry = option_chain_long['expiration'].min()
 
-    option_chain_long['Is Third Friday'] = [is_third_friday(x) for x in option_chain_long['expiration']]
+    expiration = option_chain_long['expiration'].dt
+    option_chain_long['Is Third Friday'] = (expiration.weekday == 4) & expiration.day.between(15, 21)
     third_fridays = option_chain_long.loc[option_chain_long['Is Third Friday'] == True]
     next_monthly_exp = third_fridays['expiration'].min()
     
     
-    total_gamma = []
-    total_gamma_ex_next = []
-    total_gamma_ex_fri = []
-
-    # For each spot level, calc gamma exposure at that point
-    option_chain_copy = option_chain_long.copy()
-    print(f"   * GAMMA PROFILE CALC: starting loop (0/{len(levels)})")
-    for i, level in enumerate(levels):
-        option_chain_copy['gammaExposure'] = option_chain_copy.apply(lambda row : calc_gamma_exposure(level, row['strike'], row['impliedVolatility'], 
-                                                            row['Days untill Expiry'], 0, 0, row['optionType'], row['openInterest']), axis = 1)
-        
-        option_chain_copy_call = option_chain_copy.loc[option_chain_copy['optionType'] == 'call',:]
-        option_chain_copy_put = option_chain_copy.loc[option_chain_copy['optionType'] == 'put',:]
-        
-        total_gamma.append(option_chain_copy_call['gammaExposure'].sum() - option_chain_copy_put['gammaExposure'].sum())
-        
-        exp_next = option_chain_copy.loc[option_chain_copy['expiration'] != next_expiry]
-        exp_next_call = exp_next.loc[exp_next['optionType'] == 'call',:]
-        exp_next_put = exp_next.loc[exp_next['optionType'] == 'put',:]
-        
-        total_gamma_ex_next.append(exp_next_call['gammaExposure'].sum() - exp_next_put['gammaExposure'].sum())
-
-        exp_fri = option_chain_copy.loc[option_chain_copy['expiration'] != next_monthly_exp]
-        exp_fri_call = exp_fri.loc[exp_fri['optionType'] == 'call',:]
-        exp_fri_put = exp_fri.loc[exp_fri['optionType'] == 'put',:]
-        total_gamma_ex_fri.append(exp_fri_call['gammaExposure'].sum() - exp_fri_put['gammaExposure'].sum())
-        
-        print(f"   * GAMMA PROFILE CALC: finished loop ({i}/{len(levels)})")
-        
+    # Option data as arrays, broadcast against the spot levels.
+    # The calculation runs in the precision of the option data (float32 if it was downcast).
+    # In float32 the profile is within ~1e-5 of its peak value, but points near the
+    # zero crossing can be off by ~1e-3 relative; zero gamma moves by ~1e-4 points
+    strike = option_chain_long['strike'].to_numpy()
+    vol = option_chain_long['impliedVolatility'].to_numpy()
+    open_interest = option_chain_long['openInterest'].to_numpy()
+    dtype = np.result_type(strike, vol, open_interest, np.float32)
+    
+    strike = strike.astype(dtype, copy=False)
+    vol = vol.astype(dtype, copy=False)
+    open_interest = open_interest.astype(dtype, copy=False)
+    days_to_expiry = option_chain_long['Days untill Expiry'].to_numpy(dtype=dtype)
+    
+    # Calls add gamma exposure and puts subtract it
+    is_call = (option_chain_long['optionType'] == 'call').to_numpy()
+    is_put = (option_chain_long['optionType'] == 'put').to_numpy()
+    sign = is_call.astype(dtype) - is_put.astype(dtype)
+    
+    ex_next_mask = (option_chain_long['expiration'] != next_expiry).to_numpy()
+    ex_fri_mask = (option_chain_long['expiration'] != next_monthly_exp).to_numpy()
+
+    # For each spot level (rows), calc gamma exposure of every option (columns)
+    logger.debug("GAMMA PROFILE CALC: starting calculation (%d levels)", len(levels))
+    # A single matrix product applies the sign and expiry masks and sums over the options
+    weights = np.stack([sign, sign * ex_next_mask, sign * ex_fri_mask], axis=1)
+    
+    # Spot levels are independent, so chunks of them run in parallel (NumPy releases the GIL)
+    n_workers = min(os.cpu_count() or 1, len(levels))
+    level_chunks = np.array_split(levels.astype(dtype), n_workers)
+    profile_chunk = partial(
+        _gamma_profile_chunk,
+        K=strike, vol=vol, T=days_to_expiry, open_interest=open_interest, weights=weights)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        gamma_profiles = np.vstack(list(executor.map(profile_chunk, level_chunks)))
+    
+    total_gamma, total_gamma_ex_next, total_gamma_ex_fri = gamma_profiles.T
+    logger.debug("GAMMA PROFILE CALC: finished calculation (%d levels)", len(levels))
         
-    total_gamma = np.array(total_gamma) / 10**9
-    total_gamma_ex_next = np.array(total_gamma_ex_next) / 10**9
-    total_gamma_ex_fri = np.array(total_gamma_ex_fri) / 10**9
+    total_gamma = total_gamma / 10**9
+    total_gamma_ex_next = total_gamma_ex_next / 10**9
+    total_gamma_ex_fri = total_gamma_ex_fri / 10**9
 
     # Find Gamma Flip Point
     zero_cross_idx = np.where(np.diff(np.sign(total_gamma)))[0]
@@ -1,10 +1,13 @@
-from fastapi import FastAPI, status, HTTPException, BackgroundTasks
+from fastapi import FastAPI, status, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 import pandas as pd
 
 import os
+from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load endpoint functions
@@ -30,8 +33,15 @@ load_dotenv()
 app = FastAPI(
     title="Gamma Exposure app",
     summary="Retrieves SPX option data and calculates the gamma exposure of the options",
+    default_response_class=ORJSONResponse,
 )
 
+# Compress responses larger than 1KB (the GEX dicts grow with every execution)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Pagination cursors are MongoDB ObjectIds
+OBJECT_ID_PATTERN = '^[0-9a-fA-F]{24}$'
+
 
 # API endpoints
 # ==========================
@@ -64,8 +74,22 @@ async def execution_info():
     # response_model=StudentModel,
     # response_model_by_alias=False,
 )
-async def zero_gamma_data():
-    dict_zero_gamma = get_zero_gamma_data()
+async def zero_gamma_data(
+    response: Response,
+    since: Optional[datetime] = None,
+    after: Optional[str] = Query(None, pattern=OBJECT_ID_PATTERN),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Zero gamma of each execution, keyed by mongodb_upload_id
+    
+    Only the latest `limit` executions (50 by default) are returned, not the full history.
+    To page through the history, pass `since` and then `after` set to the X-Next-Cursor
+    header of the previous response, until an empty page comes back.
+    """
+    dict_zero_gamma, next_cursor = get_zero_gamma_data(since=since, after=after, limit=limit)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = next_cursor
         
     return dict_zero_gamma
 
@@ -76,8 +100,22 @@ async def zero_gamma_data():
     # response_model=StudentModel,
     # response_model_by_alias=False,
 )
-async def gex_profile_data():
-    dict_gex_profile = get_gex_profile_data()
+async def gex_profile_data(
+    response: Response,
+    since: Optional[datetime] = None,
+    after: Optional[str] = Query(None, pattern=OBJECT_ID_PATTERN),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Gamma exposure profile of each execution, keyed by mongodb_upload_id
+    
+    Only the latest `limit` executions (50 by default) are returned, not the full history.
+    To page through the history, pass `since` and then `after` set to the X-Next-Cursor
+    header of the previous response, until an empty page comes back.
+    """
+    dict_gex_profile, next_cursor = get_gex_profile_data(since=since, after=after, limit=limit)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = next_cursor
         
     return dict_gex_profile
 
@@ -88,8 +126,22 @@ async def gex_profile_data():
     # response_model=StudentModel,
     # response_model_by_alias=False,
 )
-async def gex_levels_data():
-    dict_gex_levels = get_gex_levels_data()
+async def gex_levels_data(
+    response: Response,
+    since: Optional[datetime] = None,
+    after: Optional[str] = Query(None, pattern=OBJECT_ID_PATTERN),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Gamma exposure by strike of each execution, keyed by mongodb_upload_id
+    
+    Only the latest `limit` executions (50 by default) are returned, not the full history.
+    To page through the history, pass `since` and then `after` set to the X-Next-Cursor
+    header of the previous response, until an empty page comes back.
+    """
+    dict_gex_levels, next_cursor = get_gex_levels_data(since=since, after=after, limit=limit)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = next_cursor
         
     return dict_gex_levels
 